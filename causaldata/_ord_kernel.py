@@ -0,0 +1,83 @@
+# causaldata/causaldata/_ord_kernel.py
+
+"""
+Kernel mapping latent normals to ordinal level codes.
+
+Cutpoints are on the latent (standard normal) scale, so each code is just
+the number of cutpoints at or below z. For large simulations (see
+use_numba) the search runs in one parallel pass over the rows with numba
+(optional, see _ord_numba); otherwise np.searchsorted is used.
+"""
+
+import importlib.util
+
+import numpy as np
+
+HAVE_NUMBA = importlib.util.find_spec("numba") is not None
+
+# Smallest simulation, in total ordinal values (n x number of ordinal
+# variables), that uses the numba kernel. Below this, np.searchsorted is
+# about as fast and numba is never imported.
+_NUMBA_MIN_SIZE = 2 ** 18
+
+
+def use_numba(n_values):
+    """
+    Whether fill_ord should use numba for a simulation of n_values
+    ordinal values in total.
+    """
+    return HAVE_NUMBA and n_values >= _NUMBA_MIN_SIZE
+
+
+def pack_cutpoints(cutpoints):
+    """
+    Pack per-variable cutpoint arrays into one flat array plus offsets.
+
+    Parameters
+    ----------
+    cutpoints : list of np.ndarray
+        Sorted latent-scale cutpoints for each ordinal variable
+
+    Returns
+    -------
+    cut_flat : np.ndarray
+        All cutpoints concatenated
+    cut_off : np.ndarray
+        Offsets such that variable j uses cut_flat[cut_off[j]:cut_off[j+1]]
+    """
+    cut_off = np.zeros(len(cutpoints) + 1, dtype=np.intp)
+    cut_off[1:] = np.cumsum([len(c) for c in cutpoints])
+    if cutpoints:
+        cut_flat = np.ascontiguousarray(np.concatenate(cutpoints), dtype=np.float64)
+    else:
+        cut_flat = np.empty(0)
+    return cut_flat, cut_off
+
+
+def _fill_ord_numpy(Z, cut_flat, cut_off, codes_out):
+    """NumPy version of fill_ord."""
+    for j in range(Z.shape[1]):
+        cut = cut_flat[cut_off[j]:cut_off[j + 1]]
+        codes_out[:, j] = np.searchsorted(cut, Z[:, j], side="right")
+
+
+def fill_ord(Z, cut_flat, cut_off, codes_out, numba=False):
+    """
+    Fill level codes for a block of ordinal latent normals.
+
+    Parameters
+    ----------
+    Z : np.ndarray
+        Latent standard normals (float32 or float64), shape (n, n_ord)
+    cut_flat, cut_off : np.ndarray
+        Packed cutpoints, as returned by pack_cutpoints
+    codes_out : np.ndarray
+        Integer array of shape (n, n_ord) receiving level indices
+    numba : bool
+        Use the numba kernel; decide once per simulation with use_numba
+    """
+    if numba:
+        from ._ord_numba import fill_ord_numba
+        fill_ord_numba(np.ascontiguousarray(Z), cut_flat, cut_off, codes_out)
+    else:
+        _fill_ord_numpy(Z, cut_flat, cut_off, codes_out)
@@ -0,0 +1,28 @@
+# causaldata/causaldata/_ord_numba.py
+
+"""
+numba-compiled ordinal kernel. Imported by _ord_kernel only when numba is
+installed and a block is large enough to be worth it.
+"""
+
+from numba import njit, prange
+
+
+@njit(parallel=True, cache=True)
+def fill_ord_numba(Z, cut_flat, cut_off, codes_out):
+    n, n_ord = Z.shape
+    # Parallelize over rows: there are usually far more rows than
+    # ordinal variables, and rows are contiguous in Z.
+    for i in prange(n):
+        for j in range(n_ord):
+            z = Z[i, j]
+            # Count of cutpoints <= z (searchsorted, side="right")
+            lo = cut_off[j]
+            hi = cut_off[j + 1]
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if cut_flat[mid] <= z:
+                    lo = mid + 1
+                else:
+                    hi = mid
+            codes_out[i, j] = lo - cut_off[j]
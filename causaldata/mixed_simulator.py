@@ -1,8 +1,116 @@
 # causaldata/causaldata/mixed_simulator.py
 
+import os
+import warnings
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, List
+
 import numpy as np
-import pandas as pd
-from scipy.stats import norm
+
+# pandas, scipy and the (optionally numba-compiled) ordinal kernel are
+# imported where they are used, so that importing causaldata and
+# configuring a simulator stays cheap.
+
+# Number of rows drawn and transformed at a time in MixedSimulator.generate
+_TILE_ROWS = 2 ** 16
+
+# Worker threads used by MixedSimulator.generate when there is more than
+# one tile
+_MAX_WORKERS = os.cpu_count() or 1
+
+# Initial capacity of the correlation matrix buffer
+_CORR_MIN_CAPACITY = 8
+
+
+def _factor_corr(corr):
+    """
+    Return a matrix L with L @ L.T equal to corr, or close to it.
+    
+    Uses the Cholesky factor when corr is positive definite. Otherwise
+    (e.g. an indefinite matrix built from pairwise correlations) warns and
+    falls back to an eigendecomposition with negative eigenvalues clipped
+    to 0, with rows rescaled so L @ L.T keeps a unit diagonal. In that case
+    L @ L.T is the nearby valid correlation matrix, not corr itself.
+    """
+    try:
+        return np.linalg.cholesky(corr)
+    except np.linalg.LinAlgError:
+        warnings.warn(
+            "Correlation matrix is not positive definite; using a nearby "
+            "positive semidefinite correlation matrix (negative eigenvalues "
+            "clipped).",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+        w, V = np.linalg.eigh(corr)
+        L = V * np.sqrt(np.clip(w, 0, None))
+        return L / np.sqrt((L * L).sum(axis=1))[:, None]
+
+
+def _compile_fill(cont, binary):
+    """
+    Build a function that fills the continuous and binary output blocks.
+    
+    The exact sequence of operations for the current variables is emitted
+    as Python source, with column indices and parameters folded in as
+    literals, and compiled once. Bounds, scaling and shifting are only
+    applied to columns that need them.
+    
+    Parameters
+    ----------
+    cont : list of tuple
+        (latent column, mean, std, min_val, max_val) per continuous variable
+    binary : list of tuple
+        (latent column, latent threshold) per binary variable
+    
+    Returns
+    -------
+    fill : callable
+        fill(Z, cont_out, bin_out) writing into cont_out[:, j] and
+        bin_out[:, j] (a bool view of the uint8 block)
+    """
+    lines = ["def fill(Z, cont_out, bin_out):"]
+    for j, (idx, mean, std, min_val, max_val) in enumerate(cont):
+        lines.append(f"    v = cont_out[:, {j}]")
+        if std == 1.0:
+            lines.append(f"    np.copyto(v, Z[:, {idx}])")
+        else:
+            lines.append(f"    np.multiply(Z[:, {idx}], {std!r}, out=v)")
+        if mean != 0.0:
+            lines.append(f"    v += {mean!r}")
+        if min_val is not None or max_val is not None:
+            lines.append(f"    np.clip(v, {min_val!r}, {max_val!r}, out=v)")
+    for j, (idx, z_thresh) in enumerate(binary):
+        lines.append(f"    np.less(Z[:, {idx}], {z_thresh!r}, out=bin_out[:, {j}])")
+    if len(lines) == 1:
+        lines.append("    pass")
+    src = "\n".join(lines) + "\n"
+    
+    namespace = {"np": np, "inf": np.inf, "nan": np.nan}
+    exec(compile(src, "<causaldata generated fill>", "exec"), namespace)
+    return namespace["fill"]
+
+
+@dataclass
+class _Plan:
+    """
+    Variable specs packed by dtype, built once and reused by generate().
+    
+    fill is the compiled transform from _compile_fill. ord_idx are column
+    indices into the latent normals, and ordinal cutpoints are on the
+    latent (standard normal) scale.
+    """
+    fill: Callable
+    cont_names: List[str]
+    bin_names: List[str]
+    ord_idx: np.ndarray
+    ord_names: List[str]
+    ord_cut_flat: np.ndarray
+    ord_cut_off: np.ndarray
+    ord_labels: List[np.ndarray]
+
 
 class MixedSimulator:
     """
@@ -31,7 +139,10 @@ class MixedSimulator:
         self.variables = []
         self.var_names = []
         self.var_index = {}
-        self.corr = None
+        self._corr_buf = None
+        self._chol = None
+        self._corr_is_identity = True
+        self._plan = None
     
     def add_continuous(self, name, mean=0, std=1, min_val=None, max_val=None):
         """
@@ -91,12 +202,14 @@ class MixedSimulator:
         levels : list
             Category labels (e.g., ['HS', 'College', 'Grad'])
         probs : list
-            Probabilities for each level (must sum to 1)
+            Probabilities for each level (non-negative, must sum to 1)
         """
         levels = list(levels)
-        probs = np.array(probs, dtype=float)
+        probs = np.asarray(probs, dtype=np.float64)
         
-        if np.abs(probs.sum() - 1) > 1e-8:
+        if (probs < 0).any():
+            raise ValueError("Ordinal variable 'probs' must be non-negative.")
+        if abs(float(probs.sum()) - 1.0) > 1e-8:
             raise ValueError("Ordinal variable 'probs' must sum to 1.")
         
         cutpoints = np.cumsum(probs)[:-1]
@@ -104,6 +217,7 @@ class MixedSimulator:
         spec = {
             "type": "ordinal",
             "levels": levels,
+            "levels_arr": np.asarray(levels),
             "cutpoints": cutpoints,
         }
         self._register(name, spec)
@@ -119,16 +233,54 @@ class MixedSimulator:
         self.var_names.append(name)
         self.variables.append(spec)
         self._expand_corr_matrix()
+        self._plan = None
+    
+    @property
+    def corr(self):
+        """
+        Correlation matrix of the latent normals, shape (k, k).
+        
+        The returned array is read-only. Change single entries with
+        set_correlation, or assign a whole symmetric (k, k) matrix.
+        """
+        if self._corr_buf is None:
+            return None
+        k = len(self.variables)
+        view = self._corr_buf[:k, :k]
+        view.flags.writeable = False
+        return view
+    
+    @corr.setter
+    def corr(self, value):
+        if self._corr_buf is None:
+            raise ValueError("No variables added. Add variables before setting corr.")
+        k = len(self.variables)
+        value = np.asarray(value, dtype=np.float64)
+        if value.shape != (k, k):
+            raise ValueError(f"Correlation matrix must have shape ({k}, {k}).")
+        if not np.allclose(value, value.T):
+            raise ValueError("Correlation matrix must be symmetric.")
+        
+        self._corr_buf[:k, :k] = value
+        self._chol = None
+        self._corr_is_identity = np.array_equal(value, np.eye(k))
     
     def _expand_corr_matrix(self):
-        """Expand correlation matrix to match number of variables."""
+        """
+        Expand correlation matrix to match number of variables.
+        
+        The matrix lives in the top-left corner of an identity buffer whose
+        capacity doubles when full, so adding k variables copies O(k^2)
+        entries in total rather than O(k^3).
+        """
         k = len(self.variables)
-        if self.corr is None:
-            self.corr = np.eye(k)
-        else:
-            new = np.eye(k)
-            new[:-1, :-1] = self.corr
-            self.corr = new
+        if self._corr_buf is None:
+            self._corr_buf = np.eye(max(k, _CORR_MIN_CAPACITY))
+        elif k > self._corr_buf.shape[0]:
+            new = np.eye(2 * self._corr_buf.shape[0])
+            new[:k - 1, :k - 1] = self._corr_buf[:k - 1, :k - 1]
+            self._corr_buf = new
+        self._chol = None
     
     def set_correlation(self, var1, var2, rho):
         """
@@ -149,81 +301,168 @@ class MixedSimulator:
         i = self.var_index[var1]
         j = self.var_index[var2]
         
-        self.corr[i, j] = rho
-        self.corr[j, i] = rho
+        self._corr_buf[i, j] = rho
+        self._corr_buf[j, i] = rho
+        self._chol = None
+        self._corr_is_identity = False
         return self
     
-    def generate(self, seed=None):
+    def generate(self, seed=None, dtype=np.float64):
         """
         Generate a DataFrame with all simulated variables.
         
         Parameters
         ----------
-        seed : int, optional
-            Random seed for reproducibility
+        seed : int or np.random.SeedSequence, optional
+            Seed for the PCG64 generator, for reproducibility
+        dtype : {np.float64, np.float32}
+            Precision of the latent normals and of the continuous columns.
+            float32 halves memory traffic on large simulations.
         
         Returns
         -------
         df : pd.DataFrame
             Generated data with all specified variables
         """
-        if seed is not None:
-            np.random.seed(seed)
+        import pandas as pd
+        from ._ord_kernel import fill_ord, use_numba
+        
+        rng = np.random.default_rng(seed)
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float32, np.float64):
+            raise ValueError("dtype must be float32 or float64.")
         
         k = len(self.variables)
         if k == 0:
             raise ValueError("No variables added. Add variables before generating.")
         
-        # Step 1: Generate correlated standard normals
-        Z = np.random.multivariate_normal(
-            mean=np.zeros(k),
-            cov=self.corr,
-            size=self.n
-        )
+        if self._plan is None:
+            self._plan = self._build_plan()
+        plan = self._plan
+        
+        # Column-major, so each variable's column is contiguous; pandas
+        # stores the transposed (C-ordered) block without copying it.
+        cont_block = np.empty((self.n, len(plan.cont_names)), dtype=dtype, order="F")
+        bin_block = np.empty((self.n, len(plan.bin_names)), dtype=np.uint8, order="F")
+        bin_view = bin_block.view(bool)
+        codes = np.empty((self.n, len(plan.ord_names)), dtype=np.intp)
+        
+        if not self._corr_is_identity:
+            if self._chol is None:
+                self._chol = _factor_corr(self.corr)
+            L_T = self._chol.T.astype(dtype, copy=False)
         
-        # Step 2: Transform to uniform [0,1]
-        U = norm.cdf(Z)
+        def draw_tile(size):
+            # Step 1: Generate correlated standard normals (independent
+            # ones need no mixing)
+            Z = rng.standard_normal((size, k), dtype=dtype)
+            if not self._corr_is_identity:
+                Z = Z @ L_T
+            return Z
         
-        # Step 3: Transform to target distributions
-        out = {}
+        def fill_tile(Z, start, stop):
+            # Step 2: Transform to target distributions with the plan's
+            # compiled transform. Continuous variables use the latent
+            # normals directly (ndtri(ndtr(z)) == z), and discrete
+            # thresholds were mapped to the latent scale in the plan, so no
+            # CDF evaluations are needed.
+            plan.fill(Z, cont_block[start:stop], bin_view[start:stop])
         
+        # Decided for the whole simulation, not per tile
+        ord_numba = use_numba(self.n * len(plan.ord_names))
+        
+        def fill_tile_ord(Z, start, stop):
+            if plan.ord_names:
+                fill_ord(Z[:, plan.ord_idx], plan.ord_cut_flat,
+                         plan.ord_cut_off, codes[start:stop], numba=ord_numba)
+        
+        # Work through the rows in tiles so the latent normals stay in cache
+        # instead of materializing the full (n, k) matrix. Rows are drawn
+        # in order, so the result does not depend on the tile size.
+        tiles = [(start, min(start + _TILE_ROWS, self.n))
+                 for start in range(0, self.n, _TILE_ROWS)]
+        n_workers = min(_MAX_WORKERS, len(tiles))
+        
+        if n_workers <= 1:
+            for start, stop in tiles:
+                Z = draw_tile(stop - start)
+                fill_tile(Z, start, stop)
+                fill_tile_ord(Z, start, stop)
+        else:
+            # The generator is not thread-safe, so tiles are drawn here in
+            # order and transformed on worker threads (the ufuncs release
+            # the GIL). Tiles write disjoint rows, so no locking is needed.
+            # The ordinal kernel stays on this thread: it is already
+            # parallel under numba, whose thread pools should not be
+            # launched from other threads. At most 2 * n_workers drawn
+            # tiles are held at once.
+            pending = deque()
+            with ThreadPoolExecutor(max_workers=n_workers) as ex:
+                for start, stop in tiles:
+                    Z = draw_tile(stop - start)
+                    pending.append(ex.submit(fill_tile, Z, start, stop))
+                    fill_tile_ord(Z, start, stop)
+                    if len(pending) > 2 * n_workers:
+                        pending.popleft().result()
+                for future in pending:
+                    future.result()
+        
+        ord_cols = {
+            name: labels.take(codes[:, j])
+            for j, (name, labels) in enumerate(zip(plan.ord_names, plan.ord_labels))
+        }
+        
+        # Step 3: Assemble the DataFrame one block per dtype, then restore
+        # the order in which variables were added.
+        frames = []
+        if plan.cont_names:
+            frames.append(pd.DataFrame(cont_block, columns=plan.cont_names, copy=False))
+        if plan.bin_names:
+            frames.append(pd.DataFrame(bin_block, columns=plan.bin_names, copy=False))
+        if ord_cols:
+            frames.append(pd.DataFrame(ord_cols))
+        
+        df = frames[0] if len(frames) == 1 else pd.concat(frames, axis=1)
+        if list(df.columns) != self.var_names:
+            df = df[self.var_names]
+        return df
+    
+    def _build_plan(self):
+        """Pack the variable specs into per-dtype arrays for generate()."""
+        from scipy.special import ndtri
+        from ._ord_kernel import pack_cutpoints
+        
+        groups = {"continuous": [], "binary": [], "ordinal": []}
         for idx, spec in enumerate(self.variables):
-            u_j = U[:, idx]
             vtype = spec["type"]
-            name = self.var_names[idx]
-            
-            if vtype == "continuous":
-                mu, sd = spec["mean"], spec["std"]
-                values = mu + sd * norm.ppf(u_j)
-                
-                # Apply bounds
-                min_val = spec.get("min_val")
-                max_val = spec.get("max_val")
-                
-                if min_val is not None:
-                    values = np.maximum(values, min_val)
-                if max_val is not None:
-                    values = np.minimum(values, max_val)
-                
-                out[name] = values
-            
-            elif vtype == "binary":
-                p = spec["prob"]
-                out[name] = (u_j < p).astype(int)
-            
-            elif vtype == "ordinal":
-                cut = spec["cutpoints"]
-                labels = np.array(spec["levels"])
-                indices = np.digitize(u_j, cut)
-                out[name] = labels[indices]
-            
-            else:
+            if vtype not in groups:
                 raise NotImplementedError(f"Unknown type: {vtype}")
+            groups[vtype].append(idx)
         
-        return pd.DataFrame(out)
+        cont = []
+        for i in groups["continuous"]:
+            spec = self.variables[i]
+            cont.append((i, spec["mean"], spec["std"], spec["min_val"], spec["max_val"]))
+        # u < p on the copula scale is z < ndtri(p) on the latent one
+        binary = [(i, float(ndtri(self.variables[i]["prob"]))) for i in groups["binary"]]
+        ords = [self.variables[i] for i in groups["ordinal"]]
+        cut_flat, cut_off = pack_cutpoints([ndtri(s["cutpoints"]) for s in ords])
+        
+        return _Plan(
+            fill=_compile_fill(cont, binary),
+            cont_names=[self.var_names[i] for i in groups["continuous"]],
+            bin_names=[self.var_names[i] for i in groups["binary"]],
+            ord_idx=np.array(groups["ordinal"], dtype=np.intp),
+            ord_names=[self.var_names[i] for i in groups["ordinal"]],
+            ord_cut_flat=cut_flat,
+            ord_cut_off=cut_off,
+            ord_labels=[s["levels_arr"] for s in ords],
+        )
     
     def summary(self):
         """Print a summary of the simulator configuration."""
+        import pandas as pd
+        
         print(f"MixedSimulator with {self.n} observations")
         print(f"\nVariables ({len(self.variables)}):")
         for name, spec in zip(self.var_names, self.variables):
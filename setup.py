@@ -32,6 +32,9 @@ setup(
         "scipy>=1.7.0",
     ],
     extras_require={
+        "fast": [
+            "numba>=0.55",
+        ],
         "dev": [
             "pytest>=7.0",
             "pytest-cov>=3.0",
@@ -63,3 +63,163 @@ def test_reproducibility():
     data2 = sim2.generate(seed=42)
     
     pd.testing.assert_frame_equal(data1, data2)
+
+def test_indefinite_correlation():
+    """Test generation when pairwise correlations are not jointly feasible"""
+    sim = MixedSimulator(n=1000)
+    sim.add_continuous("a")
+    sim.add_continuous("b")
+    sim.add_continuous("c")
+    sim.set_correlation("a", "b", 0.9)
+    sim.set_correlation("a", "c", 0.9)
+    sim.set_correlation("b", "c", -0.9)
+    
+    with pytest.warns(RuntimeWarning, match="not positive definite"):
+        data = sim.generate(seed=42)
+    
+    assert len(data) == 1000
+    assert np.isfinite(data.to_numpy()).all()
+    assert np.allclose(data.std(), 1, atol=0.1)
+
+def test_correlation_update_after_generate():
+    """Test that changing a correlation after generating takes effect"""
+    sim = MixedSimulator(n=10000)
+    sim.add_continuous("x1", mean=0, std=1)
+    sim.add_continuous("x2", mean=0, std=1)
+    sim.generate(seed=42)
+    sim.set_correlation("x1", "x2", 0.8)
+    
+    data = sim.generate(seed=42)
+    
+    observed_corr = data[["x1", "x2"]].corr().iloc[0, 1]
+    assert abs(observed_corr - 0.8) < 0.05
+
+def test_binary_generation():
+    """Test binary variable generation"""
+    sim = MixedSimulator(n=1000)
+    sim.add_binary("t", prob=0.3)
+    
+    data = sim.generate(seed=42)
+    
+    assert data["t"].dtype == np.uint8
+    assert set(data["t"].unique()) <= {0, 1}
+    assert abs(data["t"].mean() - 0.3) < 0.05
+
+def test_column_order_mixed_types():
+    """Test that columns follow the order variables were added"""
+    sim = MixedSimulator(n=100)
+    sim.add_binary("t", prob=0.5)
+    sim.add_ordinal("edu", levels=["HS", "College"], probs=[0.5, 0.5])
+    sim.add_continuous("x", mean=0, std=1)
+    sim.add_binary("z", prob=0.2)
+    
+    data = sim.generate(seed=42)
+    
+    assert list(data.columns) == ["t", "edu", "x", "z"]
+    assert len(data) == 100
+
+def test_tiling_does_not_change_output(monkeypatch):
+    """Test that results do not depend on tile size or thread count"""
+    from causaldata import mixed_simulator
+    
+    sim = MixedSimulator(n=1000)
+    sim.add_continuous("x", mean=0, std=1, min_val=-1)
+    sim.add_binary("t", prob=0.3)
+    sim.add_ordinal("edu", levels=["HS", "College", "Grad"], probs=[0.3, 0.5, 0.2])
+    sim.set_correlation("x", "t", 0.5)
+    
+    data1 = sim.generate(seed=42)
+    monkeypatch.setattr(mixed_simulator, "_TILE_ROWS", 64)
+    monkeypatch.setattr(mixed_simulator, "_MAX_WORKERS", 1)
+    data2 = sim.generate(seed=42)
+    monkeypatch.setattr(mixed_simulator, "_MAX_WORKERS", 4)
+    data3 = sim.generate(seed=42)
+    
+    pd.testing.assert_frame_equal(data1, data2)
+    pd.testing.assert_frame_equal(data1, data3)
+
+def test_many_variables():
+    """Test that correlations survive growing the correlation matrix"""
+    sim = MixedSimulator(n=100)
+    sim.add_continuous("x0")
+    sim.add_continuous("x1")
+    sim.set_correlation("x0", "x1", 0.5)
+    for i in range(2, 20):
+        sim.add_continuous(f"x{i}")
+    sim.set_correlation("x18", "x19", -0.3)
+    
+    expected = np.eye(20)
+    expected[0, 1] = expected[1, 0] = 0.5
+    expected[18, 19] = expected[19, 18] = -0.3
+    np.testing.assert_array_equal(sim.corr, expected)
+    assert sim.generate(seed=42).shape == (100, 20)
+
+def test_ordinal_invalid_probs():
+    """Test that invalid ordinal probabilities are rejected"""
+    sim = MixedSimulator(n=100)
+    
+    with pytest.raises(ValueError, match="sum to 1"):
+        sim.add_ordinal("a", levels=["lo", "hi"], probs=[0.5, 0.6])
+    with pytest.raises(ValueError, match="non-negative"):
+        sim.add_ordinal("b", levels=["lo", "mid", "hi"], probs=[0.6, -0.1, 0.5])
+
+def test_float32_generation():
+    """Test single-precision generation"""
+    sim = MixedSimulator(n=10000)
+    sim.add_continuous("x1", mean=5, std=2, min_val=0)
+    sim.add_continuous("x2", mean=0, std=1)
+    sim.add_binary("t", prob=0.3)
+    sim.add_ordinal("edu", levels=["HS", "College", "Grad"], probs=[0.3, 0.5, 0.2])
+    sim.set_correlation("x1", "x2", 0.8)
+    
+    data = sim.generate(seed=42, dtype=np.float32)
+    
+    assert data["x1"].dtype == np.float32
+    assert data["x1"].min() >= 0
+    assert data["t"].dtype == np.uint8
+    assert abs(data[["x1", "x2"]].corr().iloc[0, 1] - 0.8) < 0.05
+    assert abs((data["edu"] == "College").mean() - 0.5) < 0.05
+    
+    with pytest.raises(ValueError):
+        sim.generate(seed=42, dtype=np.int64)
+
+def test_add_variable_after_generate():
+    """Test that variables added after generating are included"""
+    sim = MixedSimulator(n=100)
+    sim.add_continuous("x", mean=0, std=1)
+    sim.generate(seed=42)
+    sim.add_binary("t", prob=0.5)
+    sim.add_continuous("y", mean=10, std=2, max_val=12)
+    
+    data = sim.generate(seed=42)
+    
+    assert list(data.columns) == ["x", "t", "y"]
+    assert data["y"].max() <= 12
+
+def test_corr_is_read_only():
+    """Test that corr cannot be edited in place"""
+    sim = MixedSimulator(n=100)
+    sim.add_continuous("x1")
+    sim.add_continuous("x2")
+    
+    with pytest.raises(ValueError):
+        sim.corr[0, 1] = 0.9
+    
+    sim.set_correlation("x1", "x2", 0.9)
+    assert sim.corr[0, 1] == sim.corr[1, 0] == 0.9
+
+def test_assign_corr_matrix():
+    """Test assigning a whole correlation matrix"""
+    sim = MixedSimulator(n=10000)
+    sim.add_continuous("x1")
+    sim.add_continuous("x2")
+    sim.generate(seed=42)
+    
+    sim.corr = [[1.0, 0.8], [0.8, 1.0]]
+    data = sim.generate(seed=42)
+    
+    assert abs(data[["x1", "x2"]].corr().iloc[0, 1] - 0.8) < 0.05
+    with pytest.raises(ValueError, match="shape"):
+        sim.corr = np.eye(3)
+    with pytest.raises(ValueError, match="symmetric"):
+        sim.corr = [[1.0, 0.8], [0.1, 1.0]]
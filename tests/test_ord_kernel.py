@@ -0,0 +1,94 @@
+# causaldata/tests/test_ord_kernel.py
+
+import pytest
+import numpy as np
+import pandas as pd
+from causaldata._ord_kernel import fill_ord, pack_cutpoints
+
+# Latent values including exact ties with the cutpoints below
+Z_FIXED = np.array([
+    [-1.0, -1.0],
+    [-0.5, 0.0],
+    [0.0, 0.5],
+    [0.8, -0.1],
+    [2.0, 3.0],
+])
+CUTPOINTS = [np.array([-0.5, 0.8]), np.array([0.0])]
+EXPECTED_CODES = np.array([
+    [0, 0],
+    [1, 1],
+    [1, 1],
+    [2, 0],
+    [2, 1],
+])
+
+def test_pack_cutpoints():
+    """Test packing cutpoints of different lengths"""
+    cut_flat, cut_off = pack_cutpoints(CUTPOINTS)
+    
+    np.testing.assert_array_equal(cut_flat, [-0.5, 0.8, 0.0])
+    np.testing.assert_array_equal(cut_off, [0, 2, 3])
+
+def test_fill_ord_known_codes():
+    """Test codes for fixed values, counting ties as above the cutpoint"""
+    cut_flat, cut_off = pack_cutpoints(CUTPOINTS)
+    codes = np.empty(Z_FIXED.shape, dtype=np.intp)
+    
+    fill_ord(Z_FIXED, cut_flat, cut_off, codes)
+    
+    np.testing.assert_array_equal(codes, EXPECTED_CODES)
+
+def test_fill_ord_numba_matches_searchsorted():
+    """Test the numba kernel against np.searchsorted per column"""
+    pytest.importorskip("numba")
+    from causaldata._ord_numba import fill_ord_numba
+    
+    rng = np.random.default_rng(42)
+    Z = np.vstack([Z_FIXED, rng.standard_normal((1000, 2))])
+    cut_flat, cut_off = pack_cutpoints(CUTPOINTS)
+    codes = np.empty(Z.shape, dtype=np.intp)
+    
+    fill_ord_numba(Z, cut_flat, cut_off, codes)
+    
+    for j, cut in enumerate(CUTPOINTS):
+        np.testing.assert_array_equal(codes[:, j], np.searchsorted(cut, Z[:, j], side="right"))
+
+def test_small_simulation_does_not_import_numba():
+    """Test that a small simulation never loads numba"""
+    import subprocess
+    import sys
+    
+    code = (
+        "import sys\n"
+        "from causaldata import MixedSimulator\n"
+        "sim = MixedSimulator(n=1000)\n"
+        "sim.add_ordinal('edu', levels=['HS', 'College'], probs=[0.5, 0.5])\n"
+        "sim.generate(seed=42)\n"
+        "assert 'numba' not in sys.modules\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+def test_generate_numba_branch(monkeypatch):
+    """Test that generate() uses the numba kernel above the size threshold"""
+    pytest.importorskip("numba")
+    from causaldata import MixedSimulator, _ord_kernel, _ord_numba
+    
+    calls = []
+    kernel = _ord_numba.fill_ord_numba
+    def spy(*args):
+        calls.append(args[0].shape)
+        kernel(*args)
+    monkeypatch.setattr(_ord_numba, "fill_ord_numba", spy)
+    
+    sim = MixedSimulator(n=1000)
+    sim.add_ordinal("edu", levels=["HS", "College", "Grad"], probs=[0.3, 0.5, 0.2])
+    sim.add_continuous("x")
+    sim.set_correlation("edu", "x", 0.5)
+    
+    expected = sim.generate(seed=42)
+    assert not calls
+    monkeypatch.setattr(_ord_kernel, "_NUMBA_MIN_SIZE", 1000)
+    data = sim.generate(seed=42)
+    
+    assert calls
+    pd.testing.assert_frame_equal(data, expected)